@@ -1,6 +1,8 @@
 import socket
 import ssl
 import gzip
+import zlib
+import bisect
 import tkinter
 import tkinter.font
 
@@ -32,12 +34,80 @@ BROWSER_MODES = {
 }
 
 FONTS = {}
+MAX_FONTS = 200
+
+MEASURES = {}
+MAX_MEASURES = 50000
+
+# Rough per-object sizes in bytes, used to estimate memory usage
+FONT_BYTES = 1000
+MEASURE_BYTES = 150
+NODE_BYTES = 400
+RUN_BYTES = 200
+DISPLAY_ITEM_BYTES = 200
+CHECKPOINT_BYTES = 100
+
+MEMORY_BUDGET = 64 * 1024 * 1024
 
 FONT_MODIFIERS = {
     "subscript": "subscript",
     "superscript": "superscript",
 }
 
+STYLE_OPERATIONS = {
+    "set": "set",
+    "add": "add",
+    "reset": "reset",
+}
+
+BREAK_TYPES = {
+    "line": "line",
+    "paragraph": "paragraph",
+}
+
+# (style attribute, operation, value) applied when a tag opens or closes
+OPEN_TAG_STYLES = {
+    "i": [("slant", STYLE_OPERATIONS["set"], "italic")],
+    "em": [("slant", STYLE_OPERATIONS["set"], "italic")],
+    "b": [("weight", STYLE_OPERATIONS["set"], "bold")],
+    "strong": [("weight", STYLE_OPERATIONS["set"], "bold")],
+    "small": [("size", STYLE_OPERATIONS["add"], -2)],
+    "big": [("size", STYLE_OPERATIONS["add"], 4)],
+    "code": [("family", STYLE_OPERATIONS["set"], "Monaco"), ("size", STYLE_OPERATIONS["add"], -2)],
+    "h1": [("size", STYLE_OPERATIONS["set"], 36)],
+    "h2": [("size", STYLE_OPERATIONS["set"], 24)],
+    "h3": [("size", STYLE_OPERATIONS["set"], 18)],
+    "sup": [("modifier", STYLE_OPERATIONS["set"], FONT_MODIFIERS["superscript"])],
+    "sub": [("modifier", STYLE_OPERATIONS["set"], FONT_MODIFIERS["subscript"])],
+}
+
+CLOSE_TAG_STYLES = {
+    "i": [("slant", STYLE_OPERATIONS["set"], "roman")],
+    "em": [("slant", STYLE_OPERATIONS["set"], "roman")],
+    "b": [("weight", STYLE_OPERATIONS["set"], "normal")],
+    "strong": [("weight", STYLE_OPERATIONS["set"], "normal")],
+    "small": [("size", STYLE_OPERATIONS["add"], 2)],
+    "big": [("size", STYLE_OPERATIONS["add"], -4)],
+    "code": [("family", STYLE_OPERATIONS["reset"], None), ("size", STYLE_OPERATIONS["add"], 2)],
+    "h1": [("size", STYLE_OPERATIONS["reset"], None)],
+    "h2": [("size", STYLE_OPERATIONS["reset"], None)],
+    "h3": [("size", STYLE_OPERATIONS["reset"], None)],
+    "sup": [("modifier", STYLE_OPERATIONS["set"], None)],
+    "sub": [("modifier", STYLE_OPERATIONS["set"], None)],
+}
+
+OPEN_TAG_BREAKS = {
+    "br": BREAK_TYPES["line"],
+}
+
+CLOSE_TAG_BREAKS = {
+    "p": BREAK_TYPES["paragraph"],
+    "pre": BREAK_TYPES["paragraph"],
+    "h1": BREAK_TYPES["paragraph"],
+    "h2": BREAK_TYPES["paragraph"],
+    "h3": BREAK_TYPES["line"],
+}
+
 redirect_counter = 0
 
 cache = Cache()
@@ -46,6 +116,9 @@ def get_font(size, weight, slant, family):
     key = (size, weight, slant, family)
 
     if key not in FONTS:
+        if len(FONTS) >= MAX_FONTS:
+            # Drop the oldest entry, layouts still using it keep their reference
+            del FONTS[next(iter(FONTS))]
         font = tkinter.font.Font(
             family=family,
             size=size,
@@ -55,6 +128,24 @@ def get_font(size, weight, slant, family):
         FONTS[key] = font
     return FONTS[key]
 
+def measure(font_key, text):
+    key = (font_key, text)
+
+    if key not in MEASURES:
+        if len(MEASURES) >= MAX_MEASURES:
+            # Drop the oldest entry
+            del MEASURES[next(iter(MEASURES))]
+        MEASURES[key] = get_font(*font_key).measure(text)
+    return MEASURES[key]
+
+def cache_memory_usage():
+    return len(FONTS) * FONT_BYTES + len(MEASURES) * MEASURE_BYTES
+
+def trim_caches():
+    # Entries are rebuilt on demand, layouts keep the fonts they use
+    MEASURES.clear()
+    FONTS.clear()
+
 def request(url, additional_headers = {}, redirect_number = 0):
     full_url = url
     scheme, url = url.split(":", 1)
@@ -208,17 +299,25 @@ class Element:
         return "<" + self.tag + ">"
     
     def visualize(self, indent=0):
-        if self.tag in HTMLParser.SELF_CLOSING_TAGS:
-            print(" " * indent, "<" + self.tag + " />")
-        elif len(self.children) > 0:
-            # Non self-closing with children
-            print(" " * indent, "<" + self.tag + ">")
-            for child in self.children:
-                child.visualize(indent + 2)
-            print(" " * indent, "</" + self.tag + ">")
-        else:
-            # Non self-closing without children
-            print(" " * indent, "<" + self.tag + "></" + self.tag + ">")
+        # Walks with an explicit stack so deep nesting can't hit the recursion limit
+        stack = [(self, indent, False)]
+        while stack:
+            node, indent, closing = stack.pop()
+            if isinstance(node, Text):
+                node.visualize(indent)
+            elif closing:
+                print(" " * indent, "</" + node.tag + ">")
+            elif node.tag in HTMLParser.SELF_CLOSING_TAGS:
+                print(" " * indent, "<" + node.tag + " />")
+            elif len(node.children) > 0:
+                # Non self-closing with children
+                print(" " * indent, "<" + node.tag + ">")
+                stack.append((node, indent, True))
+                for child in reversed(node.children):
+                    stack.append((child, indent + 2, False))
+            else:
+                # Non self-closing without children
+                print(" " * indent, "<" + node.tag + "></" + node.tag + ">")
 
 class HTMLParser:
     SELF_CLOSING_TAGS = [
@@ -367,123 +466,178 @@ class HTMLParser:
             parent.children.append(node)
         return self.unfinished.pop()
 
+def apply_styles(style, original_style, operations):
+    for attribute, operation, value in operations:
+        if operation == STYLE_OPERATIONS["set"]:
+            style[attribute] = value
+        elif operation == STYLE_OPERATIONS["add"]:
+            style[attribute] += value
+        elif operation == STYLE_OPERATIONS["reset"]:
+            style[attribute] = original_style[attribute]
+
+def style_runs(tree, font):
+    # Flattens the tree into (font key, modifier, text, break type) runs,
+    # font key matching get_font's arguments. Break runs carry no text.
+    original_style = {
+        "size": font.actual('size'),
+        "weight": font.actual('weight'),
+        "slant": font.actual('slant'),
+        "family": font.actual('family'),
+        "modifier": None,
+    }
+    style = dict(original_style)
+
+    runs = []
+    stack = [(tree, False)]
+    while stack:
+        node, closing = stack.pop()
+        if isinstance(node, Text):
+            font_key = (style["size"], style["weight"], style["slant"], style["family"])
+            runs.append((font_key, style["modifier"], node.text, None))
+        elif closing:
+            apply_styles(style, original_style, CLOSE_TAG_STYLES.get(node.tag, []))
+            if node.tag in CLOSE_TAG_BREAKS:
+                runs.append((None, None, "", CLOSE_TAG_BREAKS[node.tag]))
+        else:
+            apply_styles(style, original_style, OPEN_TAG_STYLES.get(node.tag, []))
+            if node.tag in OPEN_TAG_BREAKS:
+                runs.append((None, None, "", OPEN_TAG_BREAKS[node.tag]))
+            stack.append((node, True))
+            for child in reversed(node.children):
+                stack.append((child, False))
+    return runs
+
 class Layout:
-    def __init__(self, tree, font, canvas_width):
+    CHECKPOINT_LINES = 50
+
+    def __init__(self, runs, canvas_width, lazy=False):
         self.display_list = []
         self.cursor_x = HSTEP
         self.cursor_y = VSTEP
         self.canvas_width = canvas_width
         self.line = []
-        
-        self.original_font_family = font.actual('family')
-        self.original_font_size = font.actual('size')
 
-        self.current_modifier = None
+        self.runs = runs
+        self.run_index = 0
+        self.word_index = 0
+        self.split_text = None
+        self.done = False
+
+        self.line_count = 0
+        self.total_chars = sum(len(text) for font_key, modifier, text, break_type in runs)
+        self.laid_out_chars = 0
+
+        # (cursor_y, display_list index, line_count) every CHECKPOINT_LINES
+        # lines, only used by display_index_at to skip items above the view
+        self.checkpoints = []
+        self.checkpoint()
+
+        # Lazy mode only defers line breaking, the caller has already parsed
+        # the whole document and flattened it into runs
+        if not lazy:
+            self.layout_until(None)
+
+    def checkpoint(self):
+        self.checkpoints.append((
+            self.cursor_y,
+            len(self.display_list),
+            self.line_count,
+        ))
+
+    def should_checkpoint(self):
+        last_line_count = self.checkpoints[-1][2]
+        return not self.line and self.line_count - last_line_count >= Layout.CHECKPOINT_LINES
+
+    def layout_until(self, y):
+        # Lays out runs until cursor_y passes y, or everything if y is None.
+        # Resumes where the previous call stopped.
+        while self.run_index < len(self.runs):
+            if y is not None and self.cursor_y > y:
+                return
+
+            font_key, modifier, text, break_type = self.runs[self.run_index]
+            if break_type:
+                self.line_break(break_type)
+            elif not self.text(font_key, modifier, text, y):
+                return # stopped mid-run
+
+            self.laid_out_chars += len(text)
+            self.run_index += 1
+            self.word_index = 0
+            self.split_text = None
+
+            if self.should_checkpoint():
+                self.checkpoint()
+
+        if not self.done:
+            self.flush()
+            self.done = True
 
-        self.font_weight = font.actual('weight')
-        self.font_slant = font.actual('slant')
-        self.font_size = font.actual('size')
-        self.font_family = font.actual('family')
+    def estimated_height(self):
+        if self.done:
+            return self.cursor_y
 
-        self.recurse(tree)
-        self.flush()
+        laid_out_chars = self.laid_out_chars
+        if self.split_text:
+            # Account for the partially laid out run
+            run_length = len(self.runs[self.run_index][2])
+            laid_out_chars += run_length * self.word_index // len(self.split_text)
 
-    def open_tag(self, tag):
-        if tag == "i" or tag == "em":
-            self.font_slant = "italic"
-        elif tag == "b"  or tag == "strong":
-            self.font_weight = "bold"
-        elif tag == "small":
-            self.font_size -= 2
-        elif tag == "big":
-            self.font_size += 4
-        elif tag == "br":
-            self.flush()
-        elif tag == "code":
-            self.font_family = "Monaco"
-            self.font_size -= 2
-        elif tag == "h1":
-            self.font_size = 36
-        elif tag == "h2":
-            self.font_size = 24
-        elif tag == "h3":
-            self.font_size = 18
-        elif tag == "sup":
-            self.current_modifier = FONT_MODIFIERS["superscript"]
-        elif tag == "sub":
-            self.current_modifier = FONT_MODIFIERS["subscript"]
-
-    def close_tag(self, tag):
-        if tag == "i" or tag == "em":
-            self.font_slant = "roman"
-        elif tag == "b" or tag == "strong":
-            self.font_weight = "normal"
-        elif tag == "small":
-            self.font_size += 2
-        elif tag == "big":
-            self.font_size -= 4
-        elif tag == "p":
-            self.flush()
-            self.cursor_y += VSTEP
-        elif tag == "code":
-            self.font_family = self.original_font_family
-            self.font_size += 2
-        elif tag == "pre":
-            self.flush()
-            self.cursor_y += VSTEP
-        elif tag == "h1":
-            self.font_size = self.original_font_size
-            self.flush()
-            self.cursor_y += VSTEP
-        elif tag == "h2":
-            self.font_size = self.original_font_size
-            self.flush()
+        if not laid_out_chars:
+            return self.cursor_y
+        return int(self.cursor_y * self.total_chars / laid_out_chars)
+
+    def display_index_at(self, y):
+        # First display_list index that can be visible at or below y
+        position = bisect.bisect_right(self.checkpoints, y, key=lambda checkpoint: checkpoint[0])
+        if position == 0: return 0
+        return self.checkpoints[position - 1][1]
+
+    def line_break(self, break_type):
+        self.flush()
+        if break_type == BREAK_TYPES["paragraph"]:
             self.cursor_y += VSTEP
-        elif tag == "h3":
-            self.font_size = self.original_font_size
-            self.flush()
-        elif tag == "sup":
-            self.current_modifier = None
-        elif tag == "sub":
-            self.current_modifier = None
-
-    def recurse(self, tree):
-        if isinstance(tree, Text):
-            self.text(tree)
-        else:
-            self.open_tag(tree.tag)
-            for child in tree.children:
-                self.recurse(child)
-            self.close_tag(tree.tag)
 
-    def text(self, token):
-        font = get_font(self.font_size, self.font_weight, self.font_slant, self.font_family)
+    def text(self, font_key, modifier, text, stop_y=None):
+        # Returns False when it stopped at stop_y before the end of the run
+        font = get_font(*font_key)
+        space = measure(font_key, " ")
 
-        lstrip_text = token.text.lstrip(" ")
-        rstrip_text = token.text.rstrip(" ")
+        lstrip_text = text.lstrip(" ")
+        rstrip_text = text.rstrip(" ")
 
-        pre_whitespace = len(token.text) - len(lstrip_text)
-        post_whitespace = len(token.text) - len(rstrip_text)
+        pre_whitespace = len(text) - len(lstrip_text)
+        post_whitespace = len(text) - len(rstrip_text)
 
-        split_text = token.text.split()
+        if self.split_text is None:
+            self.split_text = text.split()
+        split_text = self.split_text
 
-        for index, word in enumerate(split_text):
-            w = font.measure(word)
+        for index in range(self.word_index, len(split_text)):
+            self.word_index = index
+            word = split_text[index]
+            w = measure(font_key, word)
             if self.cursor_x + w > self.canvas_width - HSTEP:
                 self.flush()
+                if self.should_checkpoint():
+                    self.checkpoint()
+                if stop_y is not None and self.cursor_y > stop_y:
+                    return False
 
             if index == 0:
                 # Ensure pre-text whitespaces are added back
-                self.cursor_x += pre_whitespace * font.measure(" ")
+                self.cursor_x += pre_whitespace * space
 
-            self.line.append((self.cursor_x, word, font, self.current_modifier))
+            self.line.append((self.cursor_x, word, font, modifier))
 
             if index + 1 < len(split_text):
                 # Add space between all words within text
-                self.cursor_x += w + font.measure(" ")
+                self.cursor_x += w + space
             else:
                 # Ensure post-text whitespaces are added back, could be 0
-                self.cursor_x += w + font.measure(" ") * post_whitespace
+                self.cursor_x += w + space * post_whitespace
+
+        return True
 
     def flush(self):
         if not self.line: return
@@ -496,8 +650,12 @@ class Layout:
 
             modifier_offset = 0
             if modifier:
-                new_font = font.copy()
-                new_font.config(size=int(font.actual('size') / 1.5))
+                new_font = get_font(
+                    int(font.actual('size') / 1.5),
+                    font.actual('weight'),
+                    font.actual('slant'),
+                    font.actual('family'),
+                )
                 modifier_offset = new_font.metrics('descent')
                 if modifier == FONT_MODIFIERS["superscript"]:
                     word_y_offset = baseline - base_ascent - modifier_offset
@@ -511,16 +669,142 @@ class Layout:
 
         self.cursor_x = HSTEP
         self.line = []
+        self.line_count += 1
 
         max_descent = max(metric["descent"] for metric in metrics)
         self.cursor_y = baseline + DEFAULT_LEADING * max_descent
+
+class Tab:
+    def __init__(self):
+        self.url = None
+        self.mode = BROWSER_MODES["normal"]
+        # Only the compressed source is kept once evicted
+        self.compressed_body = b""
+        self.body_tokens = None
+        self.node_count = 0
+        self.style_runs = None
+        self.font_size = None
+        self.layout = None
+        self.scroll = 0
+        self.last_used = 0
+
+    def navigate(self, url, mode, body):
+        self.unload()
+        self.url = url
+        self.mode = mode
+        self.compressed_body = zlib.compress(body.encode(DEFAULT_ENCODING))
+        self.scroll = 0
+
+    def __repr__(self):
+        return "Tab(" + str(self.url) + ")"
+
+    def is_loaded(self):
+        return self.body_tokens is not None
+
+    def build(self, font, canvas_width):
+        # Rebuilds whatever was evicted or went stale since the last call
+        if self.body_tokens is None:
+            body = zlib.decompress(self.compressed_body).decode(DEFAULT_ENCODING)
+            if self.mode == BROWSER_MODES["source"]:
+                body = body.replace("<", "&lt;").replace(">", "&gt;")
+            self.body_tokens = HTMLParser(body).parse()
+            self.node_count = self.count_nodes()
+            self.style_runs = None
+
+        if self.style_runs is None or self.font_size != font.actual('size'):
+            self.style_runs = style_runs(self.body_tokens, font)
+            self.font_size = font.actual('size')
+            self.layout = None
+
+        if self.layout is None or self.layout.canvas_width != canvas_width:
+            # Runs don't depend on width, reuse them
+            self.layout = Layout(self.style_runs, canvas_width, lazy=True)
+
+    def count_nodes(self):
+        count = 0
+        stack = [self.body_tokens]
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(node.children)
+        return count
+
+    def unload(self):
+        self.body_tokens = None
+        self.node_count = 0
+        self.style_runs = None
+        self.layout = None
+
+    def memory_usage(self):
+        usage = len(self.compressed_body)
+        if self.body_tokens is not None:
+            usage += self.node_count * NODE_BYTES
+        if self.style_runs is not None:
+            usage += len(self.style_runs) * RUN_BYTES
+        if self.layout is not None:
+            usage += len(self.layout.display_list) * DISPLAY_ITEM_BYTES
+            usage += len(self.layout.line) * DISPLAY_ITEM_BYTES
+            usage += len(self.layout.checkpoints) * CHECKPOINT_BYTES
+        return usage
+
+class Session:
+    # Documents share the module level FONTS, MEASURES and HTTP caches
+    def __init__(self, memory_budget=MEMORY_BUDGET):
+        self.tabs = []
+        self.active = None
+        self.memory_budget = memory_budget
+        self.clock = 0
+
+    def open(self):
+        tab = Tab()
+        self.tabs.append(tab)
+        self.activate(tab)
+        return tab
+
+    def activate(self, tab):
+        self.clock += 1
+        tab.last_used = self.clock
+        self.active = tab
+
+    def close(self, tab):
+        self.tabs.remove(tab)
+        if tab is self.active:
+            self.active = None
+            if self.tabs:
+                self.activate(max(self.tabs, key=lambda other: other.last_used))
+
+    def next_tab(self):
+        if not self.tabs: return None
+        index = self.tabs.index(self.active)
+        self.activate(self.tabs[(index + 1) % len(self.tabs)])
+        return self.active
+
+    def memory_usage(self):
+        return cache_memory_usage() + sum(tab.memory_usage() for tab in self.tabs)
+
+    def enforce_budget(self):
+        # Evict background documents, least recently used first. Tabs keep
+        # their compressed source, so if that is still too much the shared
+        # caches are trimmed when that is enough, otherwise we stay over budget.
+        usage = self.memory_usage()
+        background = [tab for tab in self.tabs if tab is not self.active and tab.is_loaded()]
+        for tab in sorted(background, key=lambda tab: tab.last_used):
+            if usage <= self.memory_budget: return
+            usage -= tab.memory_usage()
+            tab.unload()
+            usage += tab.memory_usage()
+
+        if usage <= self.memory_budget: return
+        if usage - cache_memory_usage() <= self.memory_budget:
+            trim_caches()
+
 class Browser:
     SCROLL_STEP = 100
+    LAYOUT_MARGIN = HEIGHT # lay out this far below the viewport
+    SCROLLBAR_WIDTH = 8
 
     def __init__(self):
-        self.display_list = []
-        self.body = ""
-        self.body_tokens = []
+        self.session = Session()
         self.h_step = HSTEP
         self.v_step= VSTEP
 
@@ -550,10 +834,11 @@ class Browser:
         self.window.bind("<MouseWheel>", self.mouse_scroll)
         self.window.bind("<plus>", self.zoomin)
         self.window.bind("<minus>", self.zoomout)
+        self.window.bind("<Tab>", self.next_tab)
+        self.window.bind("<Control-w>", self.close_tab)
         self.window.bind("<Configure>", self.resize)
 
         self.scroll = 0
-        self.mode = BROWSER_MODES["normal"]
         self.draw_count = 0
 
     def mouse_scroll(self, event):
@@ -564,9 +849,7 @@ class Browser:
         self.draw()
 
     def resize(self, event):
-        if (event.width != self.document["width"] or event.height != self.document["height"]) and self.display_list:
-            if event.width != self.document["width"]:
-                self.display_list = Layout(self.body_tokens, self.font, event.width).display_list
+        if (event.width != self.document["width"] or event.height != self.document["height"]) and self.session.active:
             self.document = {
                 "height": event.height,
                 "width": event.width,
@@ -585,48 +868,85 @@ class Browser:
 
     def zoomin(self, event):
         self.font.config(size=int(self.font.actual('size') * 1.2))
-        self.display_list = Layout(self.body_tokens, self.font, self.document["width"]).display_list
         self.draw()
     
     def zoomout(self, event):
         next_font_size = int(self.font.actual('size') / 1.2) if int(self.font.actual('size') / 1.2) > 9 else 9
         self.font.config(size=next_font_size)
-        self.display_list = Layout(
-            self.body_tokens,
-            self.font,
-            self.document["width"]
-            ).display_list
+        self.draw()
+
+    def next_tab(self, event):
+        if not self.session.active: return
+        self.session.active.scroll = self.scroll
+        self.scroll = self.session.next_tab().scroll
+        self.draw()
+
+    def close_tab(self, event):
+        if not self.session.active: return
+        self.session.close(self.session.active)
+        self.scroll = self.session.active.scroll if self.session.active else 0
         self.draw()
 
     def draw(self):
         self.canvas.delete("all")
-        for x, y, c, font in self.display_list:
+        tab = self.session.active
+        if not tab: return
+
+        tab.build(self.font, self.document["width"])
+        tab.layout.layout_until(self.scroll + self.document["height"] + Browser.LAYOUT_MARGIN)
+        self.session.enforce_budget()
+
+        display_list = tab.layout.display_list
+        for index in range(tab.layout.display_index_at(self.scroll), len(display_list)):
+            x, y, c, font = display_list[index]
             if y > self.scroll + self.document["height"]:
                 continue # below view
             if y + font.metrics('linespace') < self.scroll: 
                 continue # above view
             self.canvas.create_text(x, y - self.scroll, text=c, font=font, anchor="nw")
 
-    def load(self, url):
+        self.draw_scrollbar(tab.layout)
+
+    def draw_scrollbar(self, layout):
+        # Height is an estimate until the layout is done
+        document_height = layout.estimated_height()
+        if document_height <= self.document["height"]: return
+
+        top = self.scroll / document_height * self.document["height"]
+        bottom = (self.scroll + self.document["height"]) / document_height * self.document["height"]
+        self.canvas.create_rectangle(
+            self.document["width"] - Browser.SCROLLBAR_WIDTH, top,
+            self.document["width"], bottom,
+            width=0,
+            fill="blue",
+        )
+
+    def load(self, url, new_tab=False):
+        # Navigates the active tab unless a new tab is asked for
+        if new_tab or not self.session.active:
+            if self.session.active:
+                self.session.active.scroll = self.scroll
+            self.session.open()
+        tab = self.session.active
+        self.scroll = 0
+
         if url.startswith('view-source:'):
-            self.mode = BROWSER_MODES["source"]
             _, url = url.split(":", 1)
             headers, body = request(url)
-            body = body.replace("<", "&lt;").replace(">", "&gt;")
-            self.body_tokens = HTMLParser(body).parse()
-            self.display_list = Layout(self.body_tokens, self.font, self.document["width"]).display_list
+            tab.navigate(url, BROWSER_MODES["source"], body)
             self.draw()
         else:
-            self.mode = BROWSER_MODES["normal"]
             headers, body = request(url)
-            self.body_tokens = HTMLParser(body).parse()
+            tab.navigate(url, BROWSER_MODES["normal"], body)
+            tab.build(self.font, self.document["width"])
             input("Press Enter to continue...")
-            self.body_tokens.visualize()
-            self.display_list = Layout(self.body_tokens, self.font, self.document["width"]).display_list
+            tab.body_tokens.visualize()
             self.draw()
 
 if __name__ == "__main__":
     import sys
-    Browser().load(sys.argv[1])
+    browser = Browser()
+    browser.load(sys.argv[1])
+    for url in sys.argv[2:]:
+        browser.load(url, new_tab=True)
     tkinter.mainloop()
-